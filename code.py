@@ -30,12 +30,13 @@ import time
 import ssl
 import binascii
 import gc
+import json
+import random
+import re
 import wifi
-import vectorio
 import socketpool
 import adafruit_requests
 import displayio
-from jpegio import JpegDecoder
 from adafruit_display_text import label, wrap_text_to_lines
 import terminalio
 import adafruit_pycamera
@@ -44,6 +45,12 @@ import adafruit_pycamera
 # CONFIGURATION
 # ============================================================================
 
+_TRUTHY = frozenset(("true", "True", "TRUE", "1", "yes", "on"))
+
+def _bool_env(name, default):
+    """Read a boolean setting without allocating a lowercased copy"""
+    return os.getenv(name, default) in _TRUTHY
+
 class Config:
     """Configuration management - ALL values from settings.toml"""
 
@@ -64,6 +71,7 @@ class Config:
     API_TIMEOUT = int(os.getenv("API_TIMEOUT", "120"))
     API_RETRY_ATTEMPTS = int(os.getenv("API_RETRY_ATTEMPTS", "3"))
     API_RETRY_DELAY = int(os.getenv("API_RETRY_DELAY", "2"))
+    MAX_BACKOFF = int(os.getenv("MAX_BACKOFF", "60"))  # Cap on any single retry wait
 
     # Display settings
     TEXT_SCALE = int(os.getenv("TEXT_SCALE", "2"))
@@ -74,14 +82,17 @@ class Config:
 
     # Response display settings
     DEFAULT_VERBOSITY = os.getenv("DEFAULT_VERBOSITY", "BRIEF")
-    SAVE_FULL_RESPONSES = os.getenv("SAVE_FULL_RESPONSES", "true").lower() == "true"
+    SAVE_FULL_RESPONSES = _bool_env("SAVE_FULL_RESPONSES", "true")
     BRIEF_MODE_LIMIT = int(os.getenv("BRIEF_MODE_LIMIT", "200"))
 
     # Screensaver settings
     SCREENSAVER_TIMEOUT = int(os.getenv("SCREENSAVER_TIMEOUT", "120"))  # Seconds of inactivity
 
+    # Logging settings
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # INFO, WARN or ERROR
+
     # Auto-flash settings
-    AUTO_FLASH_ENABLED = os.getenv("AUTO_FLASH_ENABLED", "true").lower() == "true"
+    AUTO_FLASH_ENABLED = _bool_env("AUTO_FLASH_ENABLED", "true")
     DARK_THRESHOLD = int(os.getenv("DARK_THRESHOLD", "30"))
 
     # Camera settings
@@ -104,32 +115,29 @@ class Config:
 
     @classmethod
     def get_quality_modes(cls):
-        """Get quality modes configuration"""
-        return {
-            "LOW": cls._load_quality_mode("LOW"),
-            "MEDIUM": cls._load_quality_mode("MEDIUM"),
-            "HIGH": cls._load_quality_mode("HIGH"),
-            "ULTRA": cls._load_quality_mode("ULTRA")
-        }
-
-    QUALITY_MODES = None  # Will be loaded dynamically
-    QUALITY_MODE_ORDER = ["LOW", "MEDIUM", "HIGH", "ULTRA"]
-
-    # Resolution mapping for display
-    RESOLUTION_MAP = {
-        0: "240x240", 1: "320x240", 2: "640x480", 3: "800x600",
-        4: "1024x768", 5: "1280x720", 6: "1280x1024", 7: "1600x1200",
-        8: "1920x1080", 9: "2048x1536", 10: "2560x1440", 11: "2560x1600",
-        12: "2560x1920"
-    }
+        """Get quality modes configuration as a tuple in QUALITY_MODE_ORDER"""
+        return tuple(cls._load_quality_mode(mode) for mode in cls.QUALITY_MODE_ORDER)
+
+    QUALITY_MODE_ORDER = ("LOW", "MEDIUM", "HIGH", "ULTRA")
+    QUALITY_MODES = None  # Tuple parallel to QUALITY_MODE_ORDER - filled by _init
+    DEFAULT_QUALITY_INDEX = None  # Index of DEFAULT_QUALITY_MODE - filled by _init
+    QUALITY_TEXT = None  # "icon label" indicator text per mode - filled by _init
+
+    # Resolution strings for display, indexed by resolution code 0-12
+    RESOLUTION_STRINGS = (
+        "240x240", "320x240", "640x480", "800x600",
+        "1024x768", "1280x720", "1280x1024", "1600x1200",
+        "1920x1080", "2048x1536", "2560x1440", "2560x1600",
+        "2560x1920"
+    )
 
     @classmethod
     def validate_camera_resolution(cls):
         """Validate and log camera resolution"""
-        if cls.CAMERA_RESOLUTION in cls.RESOLUTION_MAP:
-            print(f"[INFO] Camera resolution: {cls.CAMERA_RESOLUTION} = {cls.RESOLUTION_MAP[cls.CAMERA_RESOLUTION]}")
+        if 0 <= cls.CAMERA_RESOLUTION < len(cls.RESOLUTION_STRINGS):
+            logger.info("Camera resolution: {} = {}", cls.CAMERA_RESOLUTION, cls.RESOLUTION_STRINGS[cls.CAMERA_RESOLUTION])
         else:
-            print(f"[WARN] Invalid resolution {cls.CAMERA_RESOLUTION}, using default 3")
+            logger.warn("Invalid resolution {}, using default 3", cls.CAMERA_RESOLUTION)
             cls.CAMERA_RESOLUTION = 3
 
         return cls.CAMERA_RESOLUTION
@@ -137,40 +145,77 @@ class Config:
     @classmethod
     def get_resolution_string(cls, resolution_code):
         """Get resolution string for display"""
-        return cls.RESOLUTION_MAP.get(resolution_code, "???x???")
-
-    @classmethod
-    def get_quality_mode_info(cls, mode_name):
-        """Get quality mode configuration"""
-        if cls.QUALITY_MODES is None:
-            cls.QUALITY_MODES = cls.get_quality_modes()
-        return cls.QUALITY_MODES.get(mode_name, cls.QUALITY_MODES["MEDIUM"])
+        if 0 <= resolution_code < len(cls.RESOLUTION_STRINGS):
+            return cls.RESOLUTION_STRINGS[resolution_code]
+        return "???x???"
 
     @classmethod
     def validate_quality_mode(cls, mode_name):
         """Validate quality mode exists"""
         if mode_name not in cls.QUALITY_MODE_ORDER:
-            print(f"[WARN] Invalid quality mode '{mode_name}', using MEDIUM")
+            logger.warn("Invalid quality mode '{}', using MEDIUM", mode_name)
             return "MEDIUM"
         return mode_name
 
     PROMPT_ORDER = os.getenv("PROMPT_ORDER")
+    # Parsed once - prompts are static for the whole run
+    PROMPT_NAMES = tuple(name.strip() for name in PROMPT_ORDER.split(',')) if PROMPT_ORDER else ()
+    _PROMPTS_CACHE = None  # (prompts, labels, qualities) - filled by _init
+
+    # Claude request scaffolding - built once by _init. The JSON body is
+    # PAYLOAD_PREFIX + base64 image + per-prompt suffix
+    CLAUDE_HEADERS = None
+    PAYLOAD_PREFIX = None
+
+    @classmethod
+    def _init(cls):
+        """Load quality modes, prompts and request scaffolding once at startup"""
+        if cls.QUALITY_MODES is None:
+            cls.QUALITY_MODES = cls.get_quality_modes()
+        if cls.QUALITY_TEXT is None:
+            cls.QUALITY_TEXT = tuple(
+                f"{info['icon']} {info['label']}" for info in cls.QUALITY_MODES)
+        if cls.DEFAULT_QUALITY_INDEX is None:
+            cls.DEFAULT_QUALITY_INDEX = cls.QUALITY_MODE_ORDER.index(
+                cls.validate_quality_mode(cls.DEFAULT_QUALITY_MODE))
+        if cls._PROMPTS_CACHE is None:
+            cls._PROMPTS_CACHE = cls._load_prompts()
+        if cls.CLAUDE_HEADERS is None:
+            cls.CLAUDE_HEADERS = {
+                "anthropic-version": cls.CLAUDE_API_VERSION,
+                "content-type": "application/json",
+                "x-api-key": cls.ANTHROPIC_API_KEY,
+                "connection": "keep-alive"  # Reuse the TLS socket across requests
+            }
+        if cls.PAYLOAD_PREFIX is None:
+            cls.PAYLOAD_PREFIX = (
+                '{"model":' + json.dumps(cls.CLAUDE_MODEL)
+                + ',"max_tokens":' + str(cls.CLAUDE_MAX_TOKENS)
+                + ',"messages":[{"role":"user","content":[{"type":"image",'
+                '"source":{"type":"base64","media_type":"image/jpeg","data":"'
+            ).encode('utf-8')
 
     @classmethod
     def get_prompts(cls):
+        """Get cached prompts, labels and quality ratings"""
+        if cls._PROMPTS_CACHE is None:
+            cls._PROMPTS_CACHE = cls._load_prompts()
+        return cls._PROMPTS_CACHE
+
+    @classmethod
+    def _load_prompts(cls):
         """Dynamically load ALL prompts from settings.toml including quality ratings"""
         prompts = []
         labels = []
         qualities = []
 
-        prompt_order = cls.PROMPT_ORDER
+        prompt_names = cls.PROMPT_NAMES
 
-        if not prompt_order:
-            print("[ERROR] PROMPT_ORDER not found in settings.toml")
-            return [], [], []
+        if not prompt_names:
+            logger.error("PROMPT_ORDER not found in settings.toml")
+            return (), (), ()
 
-        prompt_names = [name.strip() for name in prompt_order.split(',')]
-        print(f"[INFO] Loading {len(prompt_names)} prompts...")
+        logger.info("Loading {} prompts...", len(prompt_names))
 
         for prompt_name in prompt_names:
             prompt_var = f"{prompt_name}_PROMPT"
@@ -185,11 +230,12 @@ class Config:
                 prompts.append(prompt_text)
                 labels.append(label_text if label_text else prompt_name)
                 qualities.append(int(quality_text))
-                print(f"[INFO]   ✓ {prompt_name} (Quality {quality_text})")
+                logger.info("  ✓ {} (Quality {})", prompt_name, quality_text)
             else:
-                print(f"[WARN]   ✗ {prompt_var} not found")
+                logger.warn("  ✗ {} not found", prompt_var)
 
-        return prompts, labels, qualities
+        # Frozen for the rest of the run
+        return tuple(prompts), tuple(labels), tuple(qualities)
 
     @classmethod
     def validate(cls):
@@ -204,8 +250,7 @@ class Config:
         elif not cls.ANTHROPIC_API_KEY.startswith("sk-ant-"):
             issues.append("Invalid ANTHROPIC_API_KEY format")
 
-        prompts, labels, qualities = cls.get_prompts()
-        if len(prompts) == 0:
+        if not cls.get_prompts()[0]:
             issues.append("No prompts found in settings.toml")
 
         return issues
@@ -214,15 +259,22 @@ class Config:
 # SIMPLE LOGGER
 # ============================================================================
 
+# Resolved once; suppressed levels return before any string formatting
+_LOG_LEVEL = {"INFO": 0, "WARN": 1, "ERROR": 2}.get(Config.LOG_LEVEL.upper(), 0)
+
 class Logger:
     """Lightweight logging"""
 
     @staticmethod
     def info(msg, *args):
+        if _LOG_LEVEL > 0:
+            return
         print(f"[INFO] {msg.format(*args) if args else msg}")
 
     @staticmethod
     def warn(msg, *args):
+        if _LOG_LEVEL > 1:
+            return
         print(f"[WARN] {msg.format(*args) if args else msg}")
 
     @staticmethod
@@ -231,48 +283,105 @@ class Logger:
 
 logger = Logger()
 
+def _log_exception(context, e):
+    """Log an unexpected exception on the recovery path
+
+    Frees heap first and prints the pieces directly, so a burst of errors
+    (e.g. WiFi flapping) does not build format strings on a fragmented heap.
+    """
+    gc.collect()
+    print("[ERROR]", context, repr(e))
+
+# ============================================================================
+# MEMORY UTILITIES
+# ============================================================================
+
+def _maybe_gc(threshold=20000):
+    """Collect only when free heap drops below threshold bytes
+
+    A full gc.collect() stops the world for a heap walk, so routine cleanup
+    after frees is skipped while there is still plenty of headroom.
+    """
+    if gc.mem_free() < threshold:
+        gc.collect()
+
 # ============================================================================
 # IMAGE UTILITIES
 # ============================================================================
 
-def get_file_size_kb(filepath):
-    """Get file size in KB"""
+def _basename(path):
+    """Filename part of a path, without splitting it into a list"""
+    return path[path.rfind('/') + 1:]
+
+def _file_size_bytes(filepath):
+    """Get file size in bytes (0 if the file can't be read)"""
     try:
-        stat = os.stat(filepath)
-        return stat[6] / 1024
+        return os.stat(filepath)[6]
     except (OSError, AttributeError):
         return 0
 
-def check_image_size(filepath, mode_info):
-    """Check if captured image is within acceptable size"""
-    size_kb = get_file_size_kb(filepath)
+def check_image_size(filepath, mode_info, size_b=None):
+    """Check if captured image is within acceptable size
 
-    if size_kb > Config.MAX_IMAGE_SIZE_KB:
-        return False, int(size_kb), f"TOO LARGE! {int(size_kb)}KB > 3MB"
-
-    max_expected = mode_info.get("max_expected_kb", mode_info["target_kb"] * 1.5)
+    Pass size_b when the caller has already stat'ed the file.
+    """
+    # Integer bytes throughout - the KB value is only needed for messages
+    if size_b is None:
+        size_b = _file_size_bytes(filepath)
+    size_kb = size_b >> 10
+
+    if size_b > Config.MAX_IMAGE_SIZE_KB * 1024:
+        return False, size_kb, f"TOO LARGE! {size_kb}KB > 3MB"
+
+    target_b = mode_info["target_kb"] * 1024
+    max_expected_kb = mode_info.get("max_expected_kb")
+    if max_expected_kb is None:
+        max_expected_b = (target_b * 3) >> 1
+    else:
+        max_expected_b = max_expected_kb * 1024
 
-    if size_kb > max_expected:
-        return True, int(size_kb), f"Larger than expected: {int(size_kb)}KB"
-    elif size_kb > mode_info["target_kb"] * 1.2:
-        return True, int(size_kb), f"Good: {int(size_kb)}KB"
+    if size_b > max_expected_b:
+        return True, size_kb, f"Larger than expected: {size_kb}KB"
+    elif size_b * 5 > target_b * 6:  # > 1.2x target
+        return True, size_kb, f"Good: {size_kb}KB"
     else:
-        return True, int(size_kb), f"Perfect: {int(size_kb)}KB"
+        return True, size_kb, f"Perfect: {size_kb}KB"
 
 # ============================================================================
 # CAMERA UTILITIES
 # ============================================================================
 
+_BRIGHT_PTS_CACHE = {}
+
+# RGB565 luma lookup: red+green via the top 11 bits, blue via the low 5.
+# Same weights as (30*r + 59*g + 11*b) / 100 on 8-bit channels.
+_LUMA_RG = bytearray(
+    (1229 * (i >> 6) + 1208 * (i & 0x3F)) >> 9 for i in range(2048)
+)
+_LUMA_B = bytearray((451 * i) >> 9 for i in range(32))
+
+def _brightness_points(width, height):
+    """Sample points (center + 4 quadrants) for a frame size, cached"""
+    pts = _BRIGHT_PTS_CACHE.get((width, height))
+    if pts is None:
+        pts = (
+            (width // 2, height // 2),      # Center
+            (width // 4, height // 4),      # Top-left
+            (3 * width // 4, height // 4),  # Top-right
+            (width // 4, 3 * height // 4),  # Bottom-left
+            (3 * width // 4, 3 * height // 4),  # Bottom-right
+        )
+        _BRIGHT_PTS_CACHE[(width, height)] = pts
+    return pts
+
 def check_brightness(pycam):
     """Check if scene is too dark and needs flash"""
     try:
-        frame = None
-        for attempt in range(2):
+        # take() already blocks until the sensor delivers a frame, so a
+        # timed-out grab (None) is retried once straight away, with no sleep
+        frame = pycam.continuous_capture()
+        if frame is None:
             frame = pycam.continuous_capture()
-            if frame and hasattr(frame, 'width') and hasattr(frame, 'height'):
-                break
-            if attempt == 0:
-                time.sleep(0.1)
 
         if not frame or not hasattr(frame, 'width') or not hasattr(frame, 'height'):
             return False
@@ -284,32 +393,19 @@ def check_brightness(pycam):
             return False
 
         # Sample 5 key points for speed (center + 4 quadrants)
-        sample_points = [
-            (width // 2, height // 2),      # Center
-            (width // 4, height // 4),      # Top-left
-            (3 * width // 4, height // 4),  # Top-right
-            (width // 4, 3 * height // 4),  # Bottom-left
-            (3 * width // 4, 3 * height // 4),  # Bottom-right
-        ]
+        sample_points = _brightness_points(width, height)
 
         total_brightness = 0
 
         for x, y in sample_points:
             pixel = frame[x, y]
-            # Extract RGB using bit shifts
-            r = ((pixel >> 11) & 0x1F) << 3
-            g = ((pixel >> 5) & 0x3F) << 2
-            b = (pixel & 0x1F) << 3
-            # Use integer approximation: (30*r + 59*g + 11*b) / 100
-            brightness = (30 * r + 59 * g + 11 * b) // 100
-            total_brightness += brightness
+            total_brightness += _LUMA_RG[pixel >> 5] + _LUMA_B[pixel & 0x1F]
 
         avg_brightness = total_brightness // len(sample_points)
         is_dark = avg_brightness < Config.DARK_THRESHOLD
 
-        # Free frame memory
+        # Frame buffer is owned by the camera driver; dropping the ref is enough
         del frame
-        gc.collect()
 
         if is_dark:
             logger.info("Scene is dark (brightness: {}) - flash recommended", avg_brightness)
@@ -326,6 +422,30 @@ def check_brightness(pycam):
 # NETWORK UTILITIES
 # ============================================================================
 
+def backoff_delay(attempt, base_delay, cap=None):
+    """Exponential backoff with full jitter for retry number `attempt` (1-based)
+
+    Random waits keep several devices rebooting after a power blip from
+    retrying the access point and the API in lockstep. The wait is capped
+    at `cap` seconds (Config.MAX_BACKOFF by default).
+    """
+    if cap is None:
+        cap = Config.MAX_BACKOFF
+    return random.uniform(0, min(base_delay * (2 ** (attempt - 1)), cap))
+
+# One SocketPool, SSL context and Session for the whole run - reconnects
+# after a WiFi drop reuse them
+_POOL = None
+_SSL_CTX = None
+_SESSION = None
+
+def _get_ssl_context():
+    """Create the SSL context once - building it loads the CA bundle"""
+    global _SSL_CTX
+    if _SSL_CTX is None:
+        _SSL_CTX = ssl.create_default_context()
+    return _SSL_CTX
+
 def connect_wifi(ssid=None, password=None):
     """Connect to WiFi with retry logic"""
     ssid = ssid or Config.WIFI_SSID
@@ -335,25 +455,38 @@ def connect_wifi(ssid=None, password=None):
         logger.error("WiFi credentials not configured")
         return None
 
+    global _POOL, _SESSION
+
+    # Already up - hand back the existing session instead of reconnecting
+    if _SESSION is not None and wifi.radio.connected:
+        return _SESSION
+
+    max_attempts = Config.WIFI_RETRY_ATTEMPTS
+    timeout = Config.WIFI_TIMEOUT
+
     logger.info("Connecting to WiFi: {}", ssid)
 
-    for attempt in range(1, Config.WIFI_RETRY_ATTEMPTS + 1):
+    for attempt in range(1, max_attempts + 1):
         try:
             if wifi.radio.connected:
                 wifi.radio.stop_station()
                 time.sleep(0.5)
 
-            wifi.radio.connect(ssid, password, timeout=Config.WIFI_TIMEOUT)
+            wifi.radio.connect(ssid, password, timeout=timeout)
 
             if wifi.radio.connected:
                 logger.info("WiFi connected! IP: {}", wifi.radio.ipv4_address)
-                pool = socketpool.SocketPool(wifi.radio)
-                return adafruit_requests.Session(pool, ssl.create_default_context())
+                if _SESSION is None:
+                    if _POOL is None:
+                        _POOL = socketpool.SocketPool(wifi.radio)
+                    _SESSION = adafruit_requests.Session(_POOL, _get_ssl_context())
+                return _SESSION
 
         except Exception as e:
-            logger.warn("WiFi attempt {}/{} failed: {}", attempt, Config.WIFI_RETRY_ATTEMPTS, e)
-            if attempt < Config.WIFI_RETRY_ATTEMPTS:
-                time.sleep(2)
+            logger.warn("WiFi attempt {}/{} failed: {}", attempt, max_attempts, e)
+            if attempt < max_attempts:
+                # Short waits first - a nearby AP usually answers on a quick retry
+                time.sleep(backoff_delay(attempt, 0.5, 8))
 
     logger.error("WiFi connection failed")
     return None
@@ -362,36 +495,206 @@ def connect_wifi(ssid=None, password=None):
 # CLAUDE API CLIENT
 # ============================================================================
 
-def encode_image(image_path):
-    """Encode image to base64"""
+_B64_CHUNK = 3072  # Raw bytes per base64 step - a multiple of 3, so no mid-stream padding
+
+def _readinto_full(f, view):
+    """readinto() until view is full or EOF - short reads would pad mid-stream"""
+    n = 0
+    size = len(view)
+    while n < size:
+        got = f.readinto(view[n:])
+        if not got:
+            break
+        n += got
+    return n
+
+# SD read size for the buffered encoder (10922 * 3): large multi-block reads
+# that stay a multiple of 3, so every encoded slice is padding-free
+_JPEG_READ_SIZE = 32766
+_jpeg_read_view = None
+
+def _jpeg_read_buf():
+    """The shared SD read buffer, allocated once and kept for the whole run"""
+    global _jpeg_read_view
+    if _jpeg_read_view is None:
+        _jpeg_read_view = memoryview(bytearray(_JPEG_READ_SIZE))
+    return _jpeg_read_view
+
+def _release_jpeg_read_buf():
+    """Drop the shared SD read buffer; the next buffered body reallocates it"""
+    global _jpeg_read_view
+    _jpeg_read_view = None
+
+def stream_encode_into(buf, offset, image_path):
+    """Base64-encode a JPEG from SD into buf starting at offset
+
+    Reads the file in ~32KB blocks into the shared read buffer and encodes
+    each block in _B64_CHUNK slices; the full JPEG is never held in RAM.
+
+    Returns:
+        Offset just past the last encoded byte
+    """
+    view = _jpeg_read_buf()
+    with open(image_path, 'rb') as f:
+        while True:
+            n = _readinto_full(f, view)
+            if not n:
+                break
+            for i in range(0, n, _B64_CHUNK):
+                chunk = binascii.b2a_base64(view[i:min(i + _B64_CHUNK, n)], newline=False)
+                buf[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+    return offset
+
+class StreamingBody:
+    """File-like request body: JSON prefix + base64 JPEG from SD + suffix
+
+    Passed as data= to adafruit_requests, which measures it with seek/tell
+    and sends it through readinto(), so the encoded image is produced one
+    chunk at a time and never held in RAM. Only used when the buffered body
+    will not fit - the library sends file bodies in small writes, which is
+    much slower than one buffered send.
+    """
+
+    def __init__(self, prefix, image_path, suffix, encoded_size):
+        self._prefix = prefix
+        self._suffix = suffix
+        self._image_path = image_path
+        self._length = len(prefix) + encoded_size + len(suffix)
+        self._raw = memoryview(bytearray(_B64_CHUNK))
+        self._file = None
+        self.seek(0)
+
+    def seek(self, offset, whence=0):
+        """Rewind to the start, or jump to the end (whence=2) to measure"""
+        if offset:
+            raise OSError("StreamingBody only seeks to start or end")
+        self._close_file()
+        if whence == 2:
+            self._pos = self._length
+            self._part = 3
+            self._pending = memoryview(b"")
+        else:
+            self._pos = 0
+            self._part = 0
+            self._pending = memoryview(self._prefix)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def read(self, size=-1):
+        if size < 0:
+            size = self._length - self._pos
+        buf = bytearray(size)
+        return bytes(buf[:self.readinto(buf)])
+
+    def readinto(self, buf):
+        want = len(buf)
+        n = 0
+        while n < want:
+            if not self._pending:
+                if not self._next_part():
+                    break
+                continue
+            take = min(want - n, len(self._pending))
+            buf[n:n + take] = self._pending[:take]
+            self._pending = self._pending[take:]
+            n += take
+        self._pos += n
+        return n
+
+    def _next_part(self):
+        """Refill _pending with the next base64 chunk or the suffix"""
+        if self._part == 0:
+            self._file = open(self._image_path, 'rb')
+            self._part = 1
+        if self._part == 1:
+            n = _readinto_full(self._file, self._raw)
+            if n:
+                self._pending = memoryview(
+                    binascii.b2a_base64(self._raw[:n], newline=False))
+                return True
+            self._close_file()
+            self._part = 2
+            self._pending = memoryview(self._suffix)
+            return True
+        self._part = 3
+        return False
+
+    def _close_file(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_file()
+
+# Heap kept free beyond the buffered body: adafruit_requests copies a
+# bytearray body once more when sending, plus TLS and response buffers
+_BODY_HEADROOM = 32768
+
+def build_request_body(image_path, prompt, streaming=False):
+    """Build the Claude request JSON body
+
+    The fixed JSON prefix, the base64 image streamed straight from SD and
+    the prompt suffix are written into one pre-sized buffer, so the encoded
+    image never exists as a separate str or as a second serialized copy.
+    If the heap can't hold that buffer (and the library's send copy), or
+    streaming is set, a StreamingBody that encodes while sending is
+    returned instead.
+
+    Returns:
+        bytearray or StreamingBody, or None if the image is missing or too large
+    """
     try:
-        # Validate file exists first
+        # Validate file exists first (and get its size without reading it)
         try:
-            os.stat(image_path)
+            file_size = os.stat(image_path)[6]
         except OSError:
             logger.error("Image file not found: {}", image_path)
             return None
 
-        with open(image_path, 'rb') as f:
-            data = f.read()
+        # Reject oversize images before any buffer is allocated (the API
+        # itself refuses anything over 5MB)
+        max_size = min(Config.MAX_IMAGE_SIZE_KB * 1024, 5242880)
+        if file_size > max_size:
+            logger.error("Image too large: {} bytes (max {} bytes)", file_size, max_size)
+            return None
 
-        file_size = len(data)
+        prefix = Config.PAYLOAD_PREFIX
+        suffix = b'"}},{"type":"text","text":' + json.dumps(prompt).encode('utf-8') + b'}]}]}'
+        encoded_size = (file_size + 2) // 3 * 4
+        total_size = len(prefix) + encoded_size + len(suffix)
 
-        if file_size > 5242880:
-            logger.error("Image too large: {} bytes (max 5MB)", file_size)
-            del data
-            return None
+        # Only the buffered path uses the shared SD read buffer; count it
+        # in if it hasn't been allocated yet
+        read_buf_size = 0 if _jpeg_read_view is not None else _JPEG_READ_SIZE
 
-        base64_data = binascii.b2a_base64(data).decode('utf-8').rstrip()
-        del data  # Free memory immediately
-        gc.collect()
+        gc.collect()  # Full collect before the one large allocation
+        if streaming or gc.mem_free() < 2 * total_size + read_buf_size + _BODY_HEADROOM:
+            logger.info("Streaming {} byte request body from SD", total_size)
+            return StreamingBody(prefix, image_path, suffix, encoded_size)
 
-        if len(base64_data) > 7000000:
-            logger.error("Encoded image too large: {} bytes", len(base64_data))
-            del base64_data
+        # mem_free() is total free heap, not the largest free block, so the
+        # allocations can still fail on a fragmented heap
+        try:
+            _jpeg_read_buf()  # Long-lived; allocate it before the body, not after
+            body = bytearray(total_size)
+        except MemoryError:
+            if read_buf_size:
+                _release_jpeg_read_buf()  # Streaming doesn't need it
+            logger.info("No {} byte block free - streaming request body from SD", total_size)
+            return StreamingBody(prefix, image_path, suffix, encoded_size)
+        body[:len(prefix)] = prefix
+        end = stream_encode_into(body, len(prefix), image_path)
+
+        if end != len(prefix) + encoded_size:
+            logger.error("Image changed while encoding: {}", image_path)
             return None
 
-        return base64_data
+        body[end:] = suffix
+        return body
     except Exception as e:
         logger.error("Encode failed: {}", e)
         return None
@@ -468,6 +771,167 @@ def save_response_to_sd(image_path, response, prompt_label):
     except Exception as e:
         logger.error("Failed to save response to SD: {}", e)
 
+_TEXT_KEY = b'"text"'
+_text_buf = None  # Reused across responses - see _response_text_buf()
+
+def _response_text_buf():
+    """Buffer for a response's escaped text, sized once from CLAUDE_MAX_TOKENS
+
+    ~4 bytes per token plus room for escapes covers a full-length reply, so
+    the text is copied in without growing (and re-copying) a bytearray.
+    """
+    global _text_buf
+    if _text_buf is None:
+        _text_buf = bytearray(Config.CLAUDE_MAX_TOKENS * 4 + 1024)
+    return _text_buf
+
+def read_response_text(response):
+    """Stream the first "text" string out of a Claude API response body
+
+    Scans the body in 256-byte chunks and keeps only the raw bytes of that
+    one string value, instead of building the whole JSON dict tree. The rest
+    of the body is drained so the keep-alive socket can be reused.
+
+    Returns:
+        Decoded response text, or None if no "text" field was found
+    """
+    raw = None      # Escaped bytes of the value, once its opening quote is seen
+    size = 0        # Bytes of raw in use
+    matched = 0     # Bytes of _TEXT_KEY matched so far
+    after_key = 0   # 1 = key seen (expect ':'), 2 = colon seen (expect '"')
+    done = False
+
+    for chunk in response.iter_content(chunk_size=256):
+        if done:
+            continue
+        view = memoryview(chunk)
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if raw is not None:
+                # Copy up to the next quote, then check it is not escaped
+                j = chunk.find(b'"', i)
+                end = n if j < 0 else j
+                if size + end - i >= len(raw):
+                    raw.extend(bytes(size + end - i + 1024 - len(raw)))  # Rare: over-long reply
+                raw[size:size + end - i] = view[i:end]
+                size += end - i
+                if j < 0:
+                    break
+                i = j + 1
+                k = size
+                while k and raw[k - 1] == 0x5C:  # Trailing backslashes
+                    k -= 1
+                if (size - k) % 2:
+                    raw[size] = 0x22  # Escaped quote - part of the text
+                    size += 1
+                    continue
+                done = True
+                break
+
+            c = chunk[i]
+            i += 1
+            if after_key:
+                if c <= 0x20:
+                    continue  # Whitespace between key, colon and value
+                if after_key == 1 and c == 0x3A:
+                    after_key = 2
+                elif after_key == 2 and c == 0x22:
+                    raw = _response_text_buf()
+                else:
+                    # "text" was a value (e.g. "type":"text"), keep scanning
+                    after_key = 0
+                    matched = 1 if c == 0x22 else 0
+            elif c == _TEXT_KEY[matched]:
+                matched += 1
+                if matched == len(_TEXT_KEY):
+                    after_key = 1
+                    matched = 0
+            else:
+                matched = 1 if c == 0x22 else 0
+        del view
+
+    if not done:
+        return None
+    # Let the JSON parser resolve escapes (\n, \", \uXXXX) on this one string
+    return json.loads('"' + str(memoryview(raw)[:size], 'utf-8') + '"')
+
+def drain_response(response):
+    """Read and discard the rest of a response body
+
+    adafruit_requests does not skip unread body bytes on close(), so a
+    socket handed back with data still pending fails its next reuse check
+    and costs a fresh TLS handshake. Error bodies are small; reading them
+    out keeps the keep-alive connection usable.
+    """
+    for _ in response.iter_content(chunk_size=256):
+        pass
+
+_MESSAGE_KEY = b'"message"'
+
+def _utf8_end(buf, end):
+    """Back end off so buf[:end] does not split a UTF-8 character"""
+    k = end
+    while k > 0 and end - k < 3 and buf[k - 1] & 0xC0 == 0x80:
+        k -= 1  # Continuation bytes
+    if k > 0 and buf[k - 1] >= 0xC0:
+        lead = buf[k - 1]
+        need = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        if end - k + 1 < need:
+            return k - 1
+    return end
+
+def read_error_message(response, limit=512):
+    """Pull error.message out of the head of an API error body
+
+    Only the first `limit` bytes are kept; the rest of the body is drained
+    so the keep-alive socket can be reused.
+
+    Returns:
+        The message (possibly cut short), or None if none was found
+    """
+    head = bytearray()
+    for chunk in response.iter_content(chunk_size=256):
+        if len(head) < limit:
+            head.extend(chunk[:limit - len(head)])
+
+    # Find "message" followed by optional whitespace, ':' and the opening quote
+    n = len(head)
+    i = head.find(_MESSAGE_KEY)
+    while i >= 0:
+        i += len(_MESSAGE_KEY)
+        while i < n and head[i] <= 0x20:
+            i += 1
+        if i < n and head[i] == 0x3A:
+            i += 1
+            while i < n and head[i] <= 0x20:
+                i += 1
+            if i < n and head[i] == 0x22:
+                break
+        i = head.find(_MESSAGE_KEY, i)
+    if i < 0:
+        return None
+    i += 1
+
+    j = i
+    while True:
+        j = head.find(b'"', j)
+        if j < 0:
+            j = _utf8_end(head, n)  # Cut off by the limit
+            break
+        k = j
+        while head[k - 1] == 0x5C:  # Run of backslashes before the quote
+            k -= 1
+        if not (j - k) % 2:  # Even run - the quote itself is not escaped
+            break
+        j += 1
+    try:
+        return str(head[i:j], 'utf-8')
+    except UnicodeError:
+        return None
+
+_SEP60 = "=" * 60  # Response banner rule, built once
+
 def send_to_claude(requests_session, image_path, prompt, prompt_label, pycam=None):
     """Send image to Claude API with cancellation support
 
@@ -481,226 +945,217 @@ def send_to_claude(requests_session, image_path, prompt, prompt_label, pycam=Non
         return False, "Error: No API key"
 
     # Log which image is being sent
-    image_filename = image_path.split('/')[-1] if image_path else "unknown"
+    image_filename = _basename(image_path) if image_path else "unknown"
     logger.info("=== SENDING TO CLAUDE: {} with prompt '{}' ===", image_filename, prompt_label)
 
     logger.info("Encoding image for Claude API...")
-    base64_image = encode_image(image_path)
-    if not base64_image:
+    body = build_request_body(image_path, prompt)
+    if not body:
         return False, "Error: Image too large or encoding failed"
 
-    headers = {
-        "anthropic-version": Config.CLAUDE_API_VERSION,
-        "content-type": "application/json",
-        "x-api-key": Config.ANTHROPIC_API_KEY
-    }
-
-    payload = {
-        "model": Config.CLAUDE_MODEL,
-        "max_tokens": Config.CLAUDE_MAX_TOKENS,
-        "messages": [{
-            "role": "user",
-            "content": [
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/jpeg",
-                        "data": base64_image
-                    }
-                },
-                {
-                    "type": "text",
-                    "text": prompt
-                }
-            ]
-        }]
-    }
-
-    for attempt in range(1, Config.API_RETRY_ATTEMPTS + 1):
-        response = None
-
-        # Check for cancel button before attempting
-        if pycam:
-            try:
-                pycam.keys_debounce()
-                if pycam.select.fell:
-                    logger.info("API call cancelled by user")
-                    del base64_image
-                    gc.collect()
-                    return False, "Cancelled by user"
-            except (AttributeError, RuntimeError):
-                pass
+    headers = Config.CLAUDE_HEADERS
 
-        try:
-            logger.info("Sending to Claude API (attempt {}/{})...", attempt, Config.API_RETRY_ATTEMPTS)
+    # Settings used on every retry, bound once
+    max_attempts = Config.API_RETRY_ATTEMPTS
+    retry_delay = Config.API_RETRY_DELAY
+    endpoint = Config.CLAUDE_ENDPOINT
+    timeout = Config.API_TIMEOUT
 
-            response = requests_session.post(
-                Config.CLAUDE_ENDPOINT,
-                headers=headers,
-                json=payload,
-                timeout=Config.API_TIMEOUT
-            )
+    try:
+        attempt = 0
+        while attempt < max_attempts:
+            attempt += 1
+            response = None
 
-            if response.status_code == 200:
+            # Check for cancel button before attempting
+            if pycam:
                 try:
-                    result = response.json()
-
-                    if "content" not in result:
-                        logger.error("API response missing 'content' field")
-                        return False, "Error: Invalid API response (no content)"
-
-                    if not result["content"] or len(result["content"]) == 0:
-                        logger.error("API response has empty content array")
-                        return False, "Error: Empty API response"
-
-                    if "text" not in result["content"][0]:
-                        logger.error("API response missing 'text' field")
-                        return False, "Error: Invalid API response (no text)"
-
-                    response_text = result["content"][0]["text"]
-
-                    if not response_text:
-                        logger.error("API returned empty text")
-                        return False, "Error: Empty response from Claude"
-
-                    # Log response preview for debugging
-                    response_preview = response_text[:50].replace('\n', ' ') if len(response_text) > 50 else response_text.replace('\n', ' ')
-                    logger.info("=== RECEIVED RESPONSE: '{}...' (len={}) ===", response_preview, len(response_text))
-
-                    print("="*60)
-                    print(f"PROMPT: {prompt_label}")
-                    print("="*60)
-                    print(response_text)
-                    print("="*60)
-                    print("")
+                    pycam.keys_debounce()
+                    if pycam.select.fell:
+                        logger.info("API call cancelled by user")
+                        return False, "Cancelled by user"
+                except (AttributeError, RuntimeError):
+                    pass
 
-                    try:
-                        save_response(image_path, response_text, prompt_label)
-                    except Exception as e:
-                        logger.warn("Save failed: {}", e)
+            try:
+                logger.info("Sending to Claude API (attempt {}/{})...", attempt, max_attempts)
 
-                    del base64_image, result
+                try:
+                    response = requests_session.post(
+                        endpoint,
+                        headers=headers,
+                        data=body,
+                        timeout=timeout
+                    )
+                except MemoryError:
+                    # adafruit_requests copies a bytearray body before sending;
+                    # retrying that copy can't help, so switch to streaming
+                    if isinstance(body, StreamingBody):
+                        logger.error("Out of memory sending request")
+                        return False, "Error: Low memory"
+                    logger.warn("Low memory - streaming request body from SD")
+                    body = None
                     gc.collect()
-
-                    return True, response_text
-
-                except KeyError as e:
-                    logger.error("Missing key in API response: {}", e)
-                    return False, f"Error: Bad API response structure"
-                except IndexError as e:
-                    logger.error("Index error parsing API response: {}", e)
-                    return False, f"Error: Invalid API response format"
-
-            elif response.status_code == 429:
-                logger.warn("Rate limited - retry {}/{}", attempt, Config.API_RETRY_ATTEMPTS)
-                if attempt < Config.API_RETRY_ATTEMPTS:
-                    time.sleep(Config.API_RETRY_DELAY * 2)
+                    body = build_request_body(image_path, prompt, streaming=True)
+                    if not body:
+                        return False, "Error: Image too large or encoding failed"
+                    attempt -= 1  # Switching bodies doesn't use up an attempt
                     continue
-                return False, "Error: Rate limited"
 
-            elif response.status_code == 401:
-                return False, "Error: Invalid API key"
+                if response.status_code == 200:
+                    # Every 200 path returns, so the request body can go before
+                    # the reply is read - the heap is tightest right here
+                    if isinstance(body, StreamingBody):
+                        body.close()
+                    body = None
+                    gc.collect()
+                    try:
+                        # Pull just content[0].text off the socket - no dict tree.
+                        # The body is fully read (and the socket handed back)
+                        # before the slow printing and SD writes below
+                        response_text = read_response_text(response)
+
+                        if response_text is None:
+                            logger.error("API response missing 'text' field")
+                            return False, "Error: Invalid API response (no text)"
+
+                        if not response_text:
+                            logger.error("API returned empty text")
+                            return False, "Error: Empty response from Claude"
+
+                        # Log response preview for debugging
+                        response_preview = response_text[:50].replace('\n', ' ') if len(response_text) > 50 else response_text.replace('\n', ' ')
+                        logger.info("=== RECEIVED RESPONSE: '{}...' (len={}) ===", response_preview, len(response_text))
+
+                        print(_SEP60)
+                        print("PROMPT:", prompt_label)
+                        print(_SEP60)
+                        print(response_text)
+                        print(_SEP60)
+                        print("")
+
+                        try:
+                            save_response(image_path, response_text, prompt_label)
+                        except Exception as e:
+                            logger.warn("Save failed: {}", e)
+
+                        return True, response_text
+
+                    except (ValueError, UnicodeError) as e:
+                        logger.error("Could not decode API response text: {}", e)
+                        return False, "Error: Invalid API response format"
+
+                elif response.status_code == 429:
+                    drain_response(response)
+                    logger.warn("Rate limited - retry {}/{}", attempt, max_attempts)
+                    if attempt < max_attempts:
+                        time.sleep(backoff_delay(attempt, retry_delay * 2))
+                        continue
+                    return False, "Error: Rate limited"
 
-            elif response.status_code == 400:
-                try:
-                    error_msg = response.json().get("error", {}).get("message", "Bad request")
-                except (ValueError, KeyError, AttributeError):
-                    error_msg = "Bad request"
-                logger.error("API error: {}", error_msg)
-                return False, f"Error: {error_msg[:30]}"
+                elif response.status_code == 401:
+                    drain_response(response)
+                    return False, "Error: Invalid API key"
 
-            else:
-                logger.warn("HTTP {}", response.status_code)
-                if attempt < Config.API_RETRY_ATTEMPTS:
-                    time.sleep(Config.API_RETRY_DELAY)
-                    continue
-                return False, f"Error: HTTP {response.status_code}"
-
-        except OSError as e:
-            error_str = str(e)
-            # Extract errno if available
-            errno = None
-            if hasattr(e, 'errno'):
-                errno = e.errno
-
-            # Handle specific error codes
-            if errno == 113 or "ECONNABORTED" in error_str:
-                logger.error("Connection aborted (ECONNABORTED) - WiFi may have dropped")
-                logger.error("Attempt {}/{}", attempt, Config.API_RETRY_ATTEMPTS)
-            elif errno == -29312 or "-29312" in error_str:
-                logger.error("TLS/SSL error (-29312) - Possible WiFi interference or weak signal")
-                logger.error("Attempt {}/{}", attempt, Config.API_RETRY_ATTEMPTS)
-            elif "timed out" in error_str.lower() or "timeout" in error_str.lower():
-                logger.error("API timeout on attempt {}/{}", attempt, Config.API_RETRY_ATTEMPTS)
-            else:
-                logger.error("Network error: {}", error_str[:50])
-                logger.error("Attempt {}/{}", attempt, Config.API_RETRY_ATTEMPTS)
-
-            # For timeout errors, use special cancel-aware retry logic
-            if "timed out" in error_str.lower() or "timeout" in error_str.lower():
-                if attempt < Config.API_RETRY_ATTEMPTS:
-                    logger.info("Will retry in {} seconds (press SELECT to cancel)...", Config.API_RETRY_DELAY)
-
-                    # Wait with cancel check
-                    for _ in range(Config.API_RETRY_DELAY * 2):  # Check every 0.5s
-                        time.sleep(0.5)
-                        if pycam:
-                            try:
-                                pycam.keys_debounce()
-                                if pycam.select.fell:
-                                    logger.info("Retry cancelled by user")
-                                    del base64_image
-                                    gc.collect()
-                                    return False, "Cancelled by user"
-                            except (AttributeError, RuntimeError):
-                                pass
+                elif response.status_code == 400:
+                    error_msg = read_error_message(response) or "Bad request"
+                    logger.error("API error: {}", error_msg)
+                    return False, f"Error: {error_msg[:30]}"
 
-                    continue
                 else:
-                    del base64_image
-                    gc.collect()
-                    return False, "Error: API timeout after retries"
-
-            # For other network errors, retry with standard delay
-            if attempt < Config.API_RETRY_ATTEMPTS:
-                logger.info("Retrying network request...")
-                time.sleep(Config.API_RETRY_DELAY)
-                continue
-            else:
-                del base64_image
-                gc.collect()
-                # Return specific error message based on error type
+                    drain_response(response)
+                    logger.warn("HTTP {}", response.status_code)
+                    if attempt < max_attempts:
+                        time.sleep(backoff_delay(attempt, retry_delay))
+                        continue
+                    return False, f"Error: HTTP {response.status_code}"
+
+            except MemoryError:
+                # Raised while reading the reply: the request already went
+                # through, so sending it again would be a second billed call
+                logger.error("Out of memory reading API response")
+                return False, "Error: Low memory"
+
+            except OSError as e:
+                error_str = str(e)
+                # Extract errno if available
+                errno = None
+                if hasattr(e, 'errno'):
+                    errno = e.errno
+
+                # Handle specific error codes
                 if errno == 113 or "ECONNABORTED" in error_str:
-                    return False, "Error: WiFi connection lost"
+                    logger.error("Connection aborted (ECONNABORTED) - WiFi may have dropped")
+                    logger.error("Attempt {}/{}", attempt, max_attempts)
                 elif errno == -29312 or "-29312" in error_str:
-                    return False, "Error: TLS/SSL failure"
+                    logger.error("TLS/SSL error (-29312) - Possible WiFi interference or weak signal")
+                    logger.error("Attempt {}/{}", attempt, max_attempts)
+                elif "timed out" in error_str.lower() or "timeout" in error_str.lower():
+                    logger.error("API timeout on attempt {}/{}", attempt, max_attempts)
                 else:
-                    return False, "Error: Network failure"
+                    logger.error("Network error: {}", error_str[:50])
+                    logger.error("Attempt {}/{}", attempt, max_attempts)
+
+                # For timeout errors, use special cancel-aware retry logic
+                if "timed out" in error_str.lower() or "timeout" in error_str.lower():
+                    if attempt < max_attempts:
+                        delay = backoff_delay(attempt, retry_delay)
+                        logger.info("Will retry in {:.1f} seconds (press SELECT to cancel)...", delay)
+
+                        # Wait with cancel check
+                        for _ in range(int(delay * 2)):  # Check every 0.5s
+                            time.sleep(0.5)
+                            if pycam:
+                                try:
+                                    pycam.keys_debounce()
+                                    if pycam.select.fell:
+                                        logger.info("Retry cancelled by user")
+                                        return False, "Cancelled by user"
+                                except (AttributeError, RuntimeError):
+                                    pass
 
-        except Exception as e:
-            logger.error("Request failed: {}", str(e)[:50])
-            if attempt < Config.API_RETRY_ATTEMPTS:
-                logger.info("Retrying after error...")
-                time.sleep(Config.API_RETRY_DELAY)
-                continue
-            else:
-                del base64_image
-                gc.collect()
-                return False, f"Error: Request failed"
+                        continue
+                    else:
+                        return False, "Error: API timeout after retries"
 
-        finally:
-            if response:
-                try:
-                    response.close()
-                except (AttributeError, RuntimeError):
-                    pass
-            gc.collect()
+                # For other network errors, retry with standard delay
+                if attempt < max_attempts:
+                    logger.info("Retrying network request...")
+                    time.sleep(backoff_delay(attempt, retry_delay))
+                    continue
+                else:
+                    # Return specific error message based on error type
+                    if errno == 113 or "ECONNABORTED" in error_str:
+                        return False, "Error: WiFi connection lost"
+                    elif errno == -29312 or "-29312" in error_str:
+                        return False, "Error: TLS/SSL failure"
+                    else:
+                        return False, "Error: Network failure"
 
-    # All retries exhausted
-    del base64_image
-    gc.collect()
-    return False, "Error: All retries failed"
+            except Exception as e:
+                logger.error("Request failed: {}", str(e)[:50])
+                if attempt < max_attempts:
+                    logger.info("Retrying after error...")
+                    time.sleep(backoff_delay(attempt, retry_delay))
+                    continue
+                else:
+                    return False, f"Error: Request failed"
+
+            finally:
+                if response:
+                    try:
+                        response.close()
+                    except (AttributeError, RuntimeError):
+                        pass
+
+        # All retries exhausted
+        return False, "Error: All retries failed"
+    finally:
+        # Release the request body on every exit path
+        if isinstance(body, StreamingBody):
+            body.close()
+        body = None
+        gc.collect()
 
 def save_response(image_path, response_text, prompt_label):
     """Save Claude response as text file"""
@@ -709,17 +1164,16 @@ def save_response(image_path, response_text, prompt_label):
             logger.warn("Cannot save: missing image_path or response_text")
             return False
 
-        txt_filename = image_path.replace('.jpg', '.txt')
-        txt_filename = txt_filename[:11] + f"_{prompt_label}" + txt_filename[11:]
-
-        if "?" in txt_filename:
-            txt_filename = txt_filename.replace("?", "")
+        # /sd/img0001.jpg -> /sd/img0001_LABEL.txt ('?' is not valid on FAT)
+        if "?" in prompt_label:
+            prompt_label = prompt_label.replace("?", "")
+        txt_filename = f"{image_path[:-4]}_{prompt_label}.txt"
 
         with open(txt_filename, "w") as fp:
             fp.write(response_text)
             fp.flush()
 
-        filename_only = txt_filename.split('/')[-1]
+        filename_only = _basename(txt_filename)
         logger.info("Saved response to: {}", filename_only)
         return True
 
@@ -738,6 +1192,7 @@ class TextViewer:
         self.pycam = pycam
         self.full_text = ""
         self.lines = []
+        self._page_cache = {}  # scroll_pos -> joined page text
         self.scroll_pos = 0
         self.lines_per_page = Config.LINES_PER_PAGE
         self.palette = displayio.Palette(1)
@@ -769,6 +1224,7 @@ class TextViewer:
             self.is_active = True
 
             # Create rectangle for black background
+            import vectorio  # Only needed once a response is shown
             self.rectangle = vectorio.Rectangle(
                 pixel_shader=self.palette,
                 width=240,
@@ -820,9 +1276,10 @@ class TextViewer:
                 formatted_text = display_text.replace("*", "\n")
                 self.lines = formatted_text.split('\n')
             else:
-                # Normal text: wrap to screen width
-                wrapped_text = "\n".join(wrap_text_to_lines(display_text, Config.TEXT_WRAP_WIDTH))
-                self.lines = wrapped_text.split('\n')
+                # Normal text: wrap to screen width. wrap_text_to_lines strips
+                # newlines itself, so its result is already one entry per line.
+                self.lines = wrap_text_to_lines(display_text, Config.TEXT_WRAP_WIDTH) or [""]
+            self._page_cache = {}
 
             self._render_page()
 
@@ -832,30 +1289,14 @@ class TextViewer:
     def _render_page(self):
         """Render the current page of text"""
         try:
-            if self.text_area:
-                try:
-                    self.pycam.splash.remove(self.text_area)
-                except (ValueError, AttributeError):
-                    pass
-            if self.page_indicator:
-                try:
-                    self.pycam.splash.remove(self.page_indicator)
-                except (ValueError, AttributeError):
-                    pass
-
+            # Pages are static once wrapped; join each scroll position once.
+            # Keyed by scroll_pos since the last page clamps off the 3-line step.
             start_line = self.scroll_pos
-            end_line = min(start_line + self.lines_per_page, len(self.lines))
-            visible_text = '\n'.join(self.lines[start_line:end_line])
-
-            self.text_area = label.Label(
-                terminalio.FONT,
-                text=visible_text,
-                color=0xFFFFFF,
-                x=2,
-                y=Config.TEXT_Y_POSITION,
-                scale=Config.TEXT_SCALE
-            )
-            self.pycam.splash.append(self.text_area)
+            visible_text = self._page_cache.get(start_line)
+            if visible_text is None:
+                end_line = min(start_line + self.lines_per_page, len(self.lines))
+                visible_text = '\n'.join(self.lines[start_line:end_line])
+                self._page_cache[start_line] = visible_text
 
             total_pages = max(1, (len(self.lines) + self.lines_per_page - 1) // self.lines_per_page)
             current_page = min(total_pages, (self.scroll_pos // self.lines_per_page) + 1)
@@ -875,30 +1316,52 @@ class TextViewer:
                     indicator_text = f"{mode_indicator} Go Down"
                 else:
                     indicator_text = f"{mode_indicator} Pg {current_page}/{total_pages}"
-
-                self.page_indicator = label.Label(
-                    terminalio.FONT,
-                    text=indicator_text,
-                    color=0x00FFFF,
-                    x=5,
-                    y=232,
-                    scale=1
-                )
-                self.pycam.splash.append(self.page_indicator)
+                indicator_color = 0x00FFFF
             else:
                 # Single page - show verbosity and hint
                 indicator_text = f"{mode_indicator} UP=toggle OK=close"
+                indicator_color = 0x00FF00
+
+            # Labels are created once per show() and updated in place on scroll;
+            # anything already on screen is left alone, and an unchanged page
+            # skips the refresh entirely
+            changed = False
+            if self.text_area is None:
+                self.text_area = label.Label(
+                    terminalio.FONT,
+                    text=visible_text,
+                    color=0xFFFFFF,
+                    x=2,
+                    y=Config.TEXT_Y_POSITION,
+                    scale=Config.TEXT_SCALE
+                )
+                self.pycam.splash.append(self.text_area)
+                changed = True
+            elif self.text_area.text != visible_text:
+                self.text_area.text = visible_text
+                changed = True
+
+            if self.page_indicator is None:
                 self.page_indicator = label.Label(
                     terminalio.FONT,
                     text=indicator_text,
-                    color=0x00FF00,
+                    color=indicator_color,
                     x=5,
                     y=232,
                     scale=1
                 )
                 self.pycam.splash.append(self.page_indicator)
+                changed = True
+            else:
+                if self.page_indicator.text != indicator_text:
+                    self.page_indicator.text = indicator_text
+                    changed = True
+                if self.page_indicator.color != indicator_color:
+                    self.page_indicator.color = indicator_color
+                    changed = True
 
-            self.pycam.display.refresh()
+            if changed:
+                self.pycam.display.refresh()
 
         except Exception as e:
             logger.error("Failed to render page: {}", e)
@@ -953,6 +1416,7 @@ class TextViewer:
         self.rectangle = None
         self.text_area = None
         self.page_indicator = None
+        self._page_cache = {}
         self.is_active = False
         logger.info("Text viewer closed")
 
@@ -960,29 +1424,35 @@ class TextViewer:
 # DISPLAY UTILITIES
 # ============================================================================
 
+_status_label = None  # One overlay Label, built on first use and reused
+
 def show_status_overlay(pycam, status_text, color=0xFFFFFF):
     """Show small status text overlaid on current display"""
+    global _status_label
     try:
         pycam._botbar.hidden = True
 
-        for item in pycam.splash:
-            if hasattr(item, '_status_overlay'):
-                try:
-                    pycam.splash.remove(item)
-                except (ValueError, AttributeError):
-                    pass
+        if _status_label is None:
+            _status_label = label.Label(
+                terminalio.FONT,
+                text=status_text,
+                color=color,
+                background_color=0x000000,
+                x=5,
+                y=225,
+                scale=1
+            )
+        else:
+            if _status_label.text != status_text:
+                _status_label.text = status_text
+            _status_label.color = color
 
-        status_label = label.Label(
-            terminalio.FONT,
-            text=status_text,
-            color=color,
-            background_color=0x000000,
-            x=5,
-            y=225,
-            scale=1
-        )
-        status_label._status_overlay = True
-        pycam.splash.append(status_label)
+        # Re-append so it sits on top, and is never in the group twice
+        try:
+            pycam.splash.remove(_status_label)
+        except ValueError:
+            pass
+        pycam.splash.append(_status_label)
         pycam.display.refresh()
 
     except Exception as e:
@@ -993,12 +1463,11 @@ def clear_status_overlay(pycam):
     try:
         pycam._botbar.hidden = False
 
-        for item in pycam.splash:
-            if hasattr(item, '_status_overlay'):
-                try:
-                    pycam.splash.remove(item)
-                except (ValueError, AttributeError):
-                    pass
+        if _status_label is not None:
+            try:
+                pycam.splash.remove(_status_label)
+            except ValueError:
+                pass
         pycam.display.refresh()
     except (AttributeError, RuntimeError):
         pass
@@ -1012,51 +1481,86 @@ def load_image_on_screen(pycam, bitmap, decoder, filepath):
         pycam.blit(bitmap)
         pycam.display.refresh()
 
-        filename_only = filepath.split('/')[-1]
+        filename_only = _basename(filepath)
         logger.info("Displayed: {}", filename_only)
 
     except Exception as e:
-        logger.error("Failed to load image {}: {}", filepath.split('/')[-1], e)
+        logger.error("Failed to load image {}: {}", _basename(filepath), e)
+
+_NUM = re.compile(r"\d+")
+
+def _image_number(filename):
+    """Sort key: first run of digits in the filename, 0 if none or too long"""
+    # Fast path for pycam's own imgNNNN.jpg names - a slice and int(), no regex
+    if filename[:3] == "img":
+        digits = filename[3:-4]
+        if digits.isdigit() and len(digits) < 10:
+            return int(digits)
+    m = _NUM.search(filename)
+    if m:
+        digits = m.group(0)
+        if len(digits) < 10:
+            return int(digits)
+    return 0
+
+def _sd_jpg_names():
+    """Yield .jpg filenames on the SD card from a single directory listing"""
+    for filename in os.listdir("/sd"):
+        if filename[-4:].lower() == ".jpg":
+            yield filename
 
 def get_sorted_images():
     """Get sorted list of images from SD card"""
     try:
-        all_images = [
-            f"/sd/{filename}"
-            for filename in os.listdir("/sd")
-            if filename.lower().endswith(".jpg")
+        # Decorate-sort-undecorate: compute each key once per file
+        pairs = [
+            (_image_number(filename), f"/sd/{filename}")
+            for filename in _sd_jpg_names()
         ]
-
-        def safe_extract_number(filename):
-            digits = ''.join(filter(str.isdigit, filename))
-            try:
-                return int(digits) if digits and len(digits) < 10 else 0
-            except (ValueError, OverflowError):
-                return 0
-
-        all_images.sort(key=safe_extract_number)
-        return all_images
+        pairs.sort()
+        return [path for _, path in pairs]
     except Exception as e:
         logger.error("Failed to list images: {}", e)
         return []
 
+def insert_sorted_image(images, path):
+    """Insert path into a get_sorted_images() list at its sorted position
+
+    pycam reuses the lowest free imgNNNN number, so a new capture can land
+    in a gap left by a deleted file rather than at the end.
+
+    Returns:
+        Index the path was inserted at, or -1 if it was already listed
+    """
+    if path in images:
+        return -1
+    key = (_image_number(_basename(path)), path)
+    lo, hi = 0, len(images)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        other = images[mid]
+        if (_image_number(_basename(other)), other) < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    images.insert(lo, path)
+    return lo
+
 def get_newest_image():
     """Get the most recent image from SD card - FAST version for post-capture"""
     try:
         newest = None
         newest_time = 0
 
-        for filename in os.listdir("/sd"):
-            if filename.lower().endswith(".jpg"):
-                filepath = f"/sd/{filename}"
-                try:
-                    stat = os.stat(filepath)
-                    mtime = stat[8]  # Modification time
-                    if mtime > newest_time:
-                        newest_time = mtime
-                        newest = filepath
-                except (OSError, IndexError):
-                    pass
+        for filename in _sd_jpg_names():
+            filepath = f"/sd/{filename}"
+            try:
+                mtime = os.stat(filepath)[8]  # Modification time
+                if mtime > newest_time:
+                    newest_time = mtime
+                    newest = filepath
+            except (OSError, IndexError):
+                pass
 
         return newest
     except (OSError, RuntimeError) as e:
@@ -1140,13 +1644,13 @@ def test_sd_card_write():
         return False, f"SD card test failed: {str(e)[:30]}"
 
 def change_quality_mode(pycam, quality_mode_index, quality_txt):
-    """Change quality mode and update display - consolidated function"""
-    current_mode = Config.QUALITY_MODE_ORDER[quality_mode_index]
-    mode_info = Config.get_quality_mode_info(current_mode)
+    """Change quality mode and update the label - caller refreshes the display"""
+    mode_info = Config.QUALITY_MODES[quality_mode_index]
 
     pycam.resolution = mode_info["resolution"]
-    quality_txt.text = f"{mode_info['icon']} {mode_info['label']}"
-    pycam.display.refresh()
+    # quality_txt holds one pre-built Label per mode; show only this one
+    for i, widget in enumerate(quality_txt):
+        widget.hidden = i != quality_mode_index
 
     logger.info("Quality: {} {} (~{}KB, max ~{}KB)",
                 mode_info['icon'], mode_info['label'],
@@ -1211,15 +1715,18 @@ def show_loading_screen(pycam, message="Loading", max_dots=5):
 # MAIN APPLICATION
 # ============================================================================
 
+_BANNER = ("=" * 50 + "\n"
+           "CloudLens - AI Vision Camera\n"
+           "CircuitPython 10.x - Version 1.0 Beta\n"
+           + "=" * 50)
+
 def main():
     """Main application"""
 
-    print("="*50)
-    print("CloudLens - AI Vision Camera")
-    print("CircuitPython 10.x - Version 1.0 Beta")
-    print("="*50)
+    print(_BANNER)
 
-    # Validate configuration
+    # Load quality modes and prompts once, then validate configuration
+    Config._init()
     issues = Config.validate()
     if issues:
         logger.warn("Configuration issues found:")
@@ -1270,8 +1777,9 @@ def main():
         pycam = adafruit_pycamera.PyCamera()
         pycam.mode = 0
 
-        quality_mode = Config.validate_quality_mode(Config.DEFAULT_QUALITY_MODE)
-        mode_info = Config.get_quality_mode_info(quality_mode)
+        quality_mode_index = Config.DEFAULT_QUALITY_INDEX
+        quality_mode = Config.QUALITY_MODE_ORDER[quality_mode_index]
+        mode_info = Config.QUALITY_MODES[quality_mode_index]
         pycam.resolution = mode_info["resolution"]
 
         pycam.effect = 0
@@ -1290,11 +1798,10 @@ def main():
         logger.error("Camera initialization failed: {}", e)
         return
 
-    # Initialize display components
-    palette = displayio.Palette(1)
-    palette[0] = 0x000000
-    decoder = JpegDecoder()
-    browse_bitmap = displayio.Bitmap(240, 240, 65535)
+    # Browse-mode decoder and 240x240 bitmap (~115KB) are created on first
+    # SELECT - most sessions never browse, and uploads want that heap
+    decoder = None
+    browse_bitmap = None
 
     # Initialize text viewer
     text_viewer = TextViewer(pycam)
@@ -1313,27 +1820,38 @@ def main():
     show_loading_screen(pycam, "Loading", max_dots=5)
 
     prompt_index = 0
-    quality_mode_index = Config.QUALITY_MODE_ORDER.index(quality_mode)
-
-    # Add prompt mode indicator to lower-left corner
-    prompt_txt = label.Label(
-        terminalio.FONT,
-        text=prompt_labels[prompt_index],
-        color=0x00DDFF,
-        x=5,
-        y=220,
-        scale=2
-    )
 
-    # Add image quality mode indicator to upper-right corner
-    quality_txt = label.Label(
-        terminalio.FONT,
-        text=f"{mode_info['icon']} {mode_info['label']}",
-        color=0x00DDFF,
-        x=140,
-        y=18,
-        scale=1
-    )
+    # Add prompt mode indicator to lower-left corner - one Label per prompt,
+    # laid out once; switching prompts just flips which one is visible
+    prompt_txt = displayio.Group()
+    prompt_label_widgets = []
+    for i, text in enumerate(prompt_labels):
+        widget = label.Label(
+            terminalio.FONT,
+            text=text,
+            color=0x00DDFF,
+            x=5,
+            y=220,
+            scale=2
+        )
+        widget.hidden = i != prompt_index
+        prompt_txt.append(widget)
+        prompt_label_widgets.append(widget)
+
+    # Add image quality mode indicator to upper-right corner - one Label per
+    # mode, shown/hidden by change_quality_mode()
+    quality_txt = displayio.Group()
+    for i, text in enumerate(Config.QUALITY_TEXT):
+        widget = label.Label(
+            terminalio.FONT,
+            text=text,
+            color=0x00DDFF,
+            x=140,
+            y=18,
+            scale=1
+        )
+        widget.hidden = i != quality_mode_index
+        quality_txt.append(widget)
 
     # Add prompt quality indicator to lower-right corner (stars)
     def quality_to_stars(quality):
@@ -1341,14 +1859,26 @@ def main():
         star_map = {1: "*", 2: "**", 3: "***"}
         return star_map.get(quality, "*")
 
-    prompt_quality_txt = label.Label(
-        terminalio.FONT,
-        text=quality_to_stars(prompt_qualities[prompt_index]),
-        color=0xFFD700,  # Gold color for stars
-        x=200,
-        y=220,
-        scale=2
-    )
+    # Star strings per prompt, built once so prompt cycling is a plain index
+    prompt_stars = [quality_to_stars(q) for q in prompt_qualities]
+
+    # One Label per distinct star string; prompt switching flips visibility
+    prompt_quality_txt = displayio.Group()
+    star_widgets = {}
+    for stars in prompt_stars:
+        if stars not in star_widgets:
+            widget = label.Label(
+                terminalio.FONT,
+                text=stars,
+                color=0xFFD700,  # Gold color for stars
+                x=200,
+                y=220,
+                scale=2
+            )
+            widget.hidden = True
+            prompt_quality_txt.append(widget)
+            star_widgets[stars] = widget
+    star_widgets[prompt_stars[prompt_index]].hidden = False
 
     # Add CloudLens branding to top-left
     branding_txt = label.Label(
@@ -1393,19 +1923,48 @@ def main():
     logger.info("  OK: Close text or send browsed image")
     logger.info("  SHUTTER: Take photo & analyze")
 
-    # MAIN LOOP
+    # Button and display handles bound once - the loop polls them every pass
+    shutter = pycam.shutter
+    up_btn = pycam.up
+    down_btn = pycam.down
+    left_btn = pycam.left
+    right_btn = pycam.right
+    ok_btn = pycam.ok
+    select_btn = pycam.select
+    display = pycam.display
+    keys_debounce = pycam.keys_debounce
+
+    # Settings the loop reads, copied out of Config once
+    screensaver_timeout = Config.SCREENSAVER_TIMEOUT
+    msg_duration = Config.MSG_DURATION
+    auto_flash = Config.AUTO_FLASH_ENABLED
+    save_full_responses = Config.SAVE_FULL_RESPONSES
+    quality_mode_order = Config.QUALITY_MODE_ORDER
+    quality_modes = Config.QUALITY_MODES
+    num_quality_modes = len(quality_mode_order)
+
+    message_until = 0  # time.monotonic() deadline for the current status message
+
+    # MAIN LOOP - no per-frame collection; the allocator collects on its own
+    # when it runs short, and the response paths collect after big frees
     while True:
         try:
-            if not system_ready:
-                pycam.display_message("Starting...", color=0xFFFF00)
-            elif browse_mode:
-                pass
-            elif showing_captured_image:
-                pass
-            elif not view_mode:
+            needs_refresh = False  # Nav handlers mark it; one refresh at the end
+
+            # A status message stays up until its deadline while buttons keep
+            # being polled. display_message() has already dropped its label,
+            # so outside the viewfinder one refresh clears it off the screen.
+            if message_until and time.monotonic() >= message_until:
+                message_until = 0
+                if view_mode or browse_mode or showing_captured_image:
+                    needs_refresh = True
+
+            # Viewfinder runs only with nothing else on screen
+            if (not (view_mode or browse_mode or showing_captured_image)
+                    and not message_until):
                 try:
                     frame = pycam.continuous_capture()
-                    if frame and hasattr(frame, 'width') and hasattr(frame, 'height'):
+                    if frame is not None:
                         pycam.blit(frame)
 
                         # Add UI elements AFTER first blit (blit clears splash)
@@ -1415,7 +1974,7 @@ def main():
                             pycam.splash.append(quality_txt)
                             pycam.splash.append(prompt_txt)
                             pycam.splash.append(prompt_quality_txt)
-                            pycam.display.refresh()
+                            display.refresh()
                             ui_elements_added = True
                             logger.info("UI elements added after blit, should persist now")
 
@@ -1433,7 +1992,7 @@ def main():
                                 scale=2
                             )
                             pycam.splash.append(ready_label)
-                            pycam.display.refresh()
+                            display.refresh()
                             time.sleep(2.0)  # Show for 2 seconds
 
                             # Clear ready message
@@ -1443,7 +2002,7 @@ def main():
                                 pass
 
                             # Refresh to clear any artifacts
-                            pycam.display.refresh()
+                            display.refresh()
 
                             ready_message_shown = True
                             ready_message_cleared = True
@@ -1451,31 +2010,36 @@ def main():
                 except (RuntimeError, AttributeError, OSError):
                     pass
 
-            pycam.keys_debounce()
+            # Nothing to redraw while reading text or browsing - poll the
+            # buttons ~50 times a second instead of spinning
+            if view_mode or browse_mode:
+                time.sleep(0.02)
+
+            keys_debounce()
 
             # Screensaver logic - turn off display after inactivity timeout
-            if Config.SCREENSAVER_TIMEOUT > 0:
+            if screensaver_timeout > 0:
                 current_time = time.monotonic()
                 elapsed = current_time - last_activity_time
 
                 # Check if any button was pressed
-                any_button_pressed = (pycam.shutter.short_count or pycam.shutter.long_press or
-                                     pycam.ok.fell or pycam.select.fell or
-                                     pycam.up.fell or pycam.down.fell or
-                                     pycam.left.fell or pycam.right.fell)
+                any_button_pressed = (shutter.short_count or shutter.long_press or
+                                     ok_btn.fell or select_btn.fell or
+                                     up_btn.fell or down_btn.fell or
+                                     left_btn.fell or right_btn.fell)
 
                 if any_button_pressed:
                     last_activity_time = current_time
                     if screensaver_active:
                         # Wake up from screensaver
-                        pycam.display.brightness = 1.0
+                        display.brightness = 1.0
                         screensaver_active = False
                         logger.info("Screensaver deactivated - display on")
                         continue  # Skip this iteration to avoid processing the wake-up button press
 
                 # Activate screensaver after timeout
-                if not screensaver_active and elapsed >= Config.SCREENSAVER_TIMEOUT:
-                    pycam.display.brightness = 0.0
+                if not screensaver_active and elapsed >= screensaver_timeout:
+                    display.brightness = 0.0
                     screensaver_active = True
                     logger.info("Screensaver activated - display off after {}s inactivity", int(elapsed))
 
@@ -1487,29 +2051,29 @@ def main():
                 continue
 
             # SHUTTER BUTTON - Now blocked until READY message is cleared and viewfinder running
-            if pycam.shutter.long_press and not view_mode:
+            if shutter.long_press and not view_mode:
                 logger.info("Autofocus triggered")
                 pycam.autofocus()
 
             # Debug: log shutter button state
-            if pycam.shutter.short_count:
+            if shutter.short_count:
                 if view_mode:
                     logger.warn("Shutter blocked - still in view_mode! Call OK to close text viewer first.")
                 else:
                     logger.info("Capture triggered - view_mode={}, browse_mode={}, showing_captured_image={}",
                                view_mode, browse_mode, showing_captured_image)
 
-            if pycam.shutter.short_count and not view_mode:
+            if shutter.short_count and not view_mode:
                 try:
-                    current_mode = Config.QUALITY_MODE_ORDER[quality_mode_index]
-                    mode_info = Config.get_quality_mode_info(current_mode)
+                    current_mode = quality_mode_order[quality_mode_index]
+                    mode_info = quality_modes[quality_mode_index]
                     logger.info("Capturing with {} mode (resolution {})", current_mode, mode_info["resolution"])
 
                     # IMMEDIATE feedback BEFORE capture - instant response to button press
                     pycam.display_message("snap", color=0x00FF00)
 
                     flash_enabled = False
-                    if Config.AUTO_FLASH_ENABLED:
+                    if auto_flash:
                         is_dark = check_brightness(pycam)
                         if is_dark:
                             pycam.led_level = 4
@@ -1529,20 +2093,30 @@ def main():
                     the_image = get_newest_image()
                     if not the_image:
                         pycam.display_message("No images", color=0xFF0000)
-                        time.sleep(Config.MSG_DURATION)
-                        gc.collect()
+                        message_until = time.monotonic() + msg_duration
+                        _maybe_gc()
                         continue
 
                     # Check if this is the same image we just sent (duplicate detection)
                     if the_image == last_sent_image:
-                        logger.error("DUPLICATE IMAGE DETECTED: {} - capture may have failed!", the_image.split('/')[-1])
+                        logger.error("DUPLICATE IMAGE DETECTED: {} - capture may have failed!", _basename(the_image))
                         pycam.display_message("Duplicate image!\nRetry capture", color=0xFF0000)
-                        time.sleep(2)
-                        gc.collect()
+                        message_until = time.monotonic() + 2
+                        _maybe_gc()
                         continue
 
-                    filename_only = the_image.split('/')[-1]
-                    # Get file details for debugging
+                    # Keep the browse list current without rescanning the card.
+                    # The shutter also works while browsing, so keep file_index
+                    # on the image that is on screen.
+                    if browse_mode and all_images:
+                        file_index %= len(all_images)
+                    pos = insert_sorted_image(all_images, the_image)
+                    if browse_mode and 0 <= pos <= file_index:
+                        file_index += 1
+
+                    filename_only = _basename(the_image)
+                    # Get file details for debugging (the size is reused below)
+                    file_size = None
                     try:
                         stat = os.stat(the_image)
                         file_mtime = stat[8]
@@ -1551,13 +2125,13 @@ def main():
                     except (OSError, IndexError):
                         logger.info("Captured: {}", filename_only)
 
-                    is_ok, size_kb, size_msg = check_image_size(the_image, mode_info)
+                    is_ok, size_kb, size_msg = check_image_size(the_image, mode_info, file_size)
                     logger.info("Image size: {}", size_msg)
 
                     if not is_ok:
                         pycam.display_message(f"TOO LARGE!\n{size_kb}KB > 3MB\nTry lower mode", color=0xFF0000)
-                        time.sleep(3)
-                        gc.collect()
+                        message_until = time.monotonic() + 3
+                        _maybe_gc()
                         continue
 
                     showing_captured_image = True
@@ -1586,7 +2160,7 @@ def main():
                         response_verbose = response
 
                         # Save full response to SD card
-                        if Config.SAVE_FULL_RESPONSES:
+                        if save_full_responses:
                             save_response_to_sd(the_image, response_verbose, prompt_labels[prompt_index])
 
                         # Show with toggle capability
@@ -1594,83 +2168,111 @@ def main():
                         view_mode = True
 
                         del response, response_brief, response_verbose  # Free memory
-                        gc.collect()
+                        _maybe_gc()
                     else:
                         clear_status_overlay(pycam)
                         # Show cancelled in yellow, errors in red
                         error_color = 0xFFFF00 if "Cancelled" in response else 0xFF0000
                         pycam.display_message(response, color=error_color)
-                        time.sleep(2)
-                        gc.collect()
+                        message_until = time.monotonic() + 2
+                        _maybe_gc()
 
                 except TypeError as e:
                     logger.error("Capture failed (TypeError): {}", e)
                     pycam.display_message("Failed", color=0xFF0000)
-                    time.sleep(Config.MSG_DURATION)
+                    message_until = time.monotonic() + msg_duration
                     pycam.live_preview_mode()
-                    gc.collect()
+                    _maybe_gc()
 
                 except RuntimeError as e:
                     logger.error("No SD card: {}", e)
                     pycam.display_message("Error\nNo SD Card", color=0xFF0000)
-                    time.sleep(Config.MSG_DURATION)
-                    gc.collect()
+                    message_until = time.monotonic() + msg_duration
+                    _maybe_gc()
 
                 except Exception as e:
                     logger.error("Unexpected error: {}", e)
                     pycam.display_message("Error", color=0xFF0000)
-                    time.sleep(Config.MSG_DURATION)
-                    gc.collect()
+                    message_until = time.monotonic() + msg_duration
+                    _maybe_gc()
 
             # UP - Toggle verbosity in text view OR change quality mode
-            if pycam.up.fell:
+            if up_btn.fell:
                 if view_mode:
                     text_viewer.toggle_verbosity()
                 elif not browse_mode:
-                    quality_mode_index = (quality_mode_index + 1) % len(Config.QUALITY_MODE_ORDER)
+                    quality_mode_index = (quality_mode_index + 1) % num_quality_modes
                     mode_info = change_quality_mode(pycam, quality_mode_index, quality_txt)
+                    needs_refresh = True
 
             # DOWN - Scroll text down OR change quality mode
-            if pycam.down.fell:
+            if down_btn.fell:
                 if view_mode:
                     text_viewer.scroll_down()
                 elif not browse_mode:
-                    quality_mode_index = (quality_mode_index - 1) % len(Config.QUALITY_MODE_ORDER)
+                    quality_mode_index = (quality_mode_index - 1) % num_quality_modes
                     mode_info = change_quality_mode(pycam, quality_mode_index, quality_txt)
+                    needs_refresh = True
 
             # LEFT/RIGHT - Navigate prompts or browse images
-            if pycam.right.fell:
+            if right_btn.fell:
                 if browse_mode:
                     file_index = (file_index + 1) % len(all_images)
                     filename = all_images[file_index]
                     load_image_on_screen(pycam, browse_bitmap, decoder, filename)
                 else:
                     # Allow prompt switching even when viewing text
-                    prompt_index = (prompt_index + 1) % num_prompts
-                    prompt_txt.text = prompt_labels[prompt_index]
-                    prompt_quality_txt.text = quality_to_stars(prompt_qualities[prompt_index])
-                    pycam.display.refresh()
+                    prompt_label_widgets[prompt_index].hidden = True
+                    star_widgets[prompt_stars[prompt_index]].hidden = True
+                    prompt_index += 1
+                    if prompt_index == num_prompts:
+                        prompt_index = 0
+                    prompt_label_widgets[prompt_index].hidden = False
+                    star_widgets[prompt_stars[prompt_index]].hidden = False
+                    needs_refresh = True
                     logger.info("Prompt: {} (Quality {})", prompt_labels[prompt_index],
                                prompt_qualities[prompt_index])
 
-            if pycam.left.fell:
+            if left_btn.fell:
                 if browse_mode:
                     file_index = (file_index - 1) % len(all_images)
                     filename = all_images[file_index]
                     load_image_on_screen(pycam, browse_bitmap, decoder, filename)
                 else:
                     # Allow prompt switching even when viewing text
-                    prompt_index = (prompt_index - 1) % num_prompts
-                    prompt_txt.text = prompt_labels[prompt_index]
-                    prompt_quality_txt.text = quality_to_stars(prompt_qualities[prompt_index])
-                    pycam.display.refresh()
+                    prompt_label_widgets[prompt_index].hidden = True
+                    star_widgets[prompt_stars[prompt_index]].hidden = True
+                    if prompt_index == 0:
+                        prompt_index = num_prompts
+                    prompt_index -= 1
+                    prompt_label_widgets[prompt_index].hidden = False
+                    star_widgets[prompt_stars[prompt_index]].hidden = False
+                    needs_refresh = True
                     logger.info("Prompt: {} (Quality {})", prompt_labels[prompt_index],
                                prompt_qualities[prompt_index])
 
             # SELECT - Browse mode
-            if pycam.select.fell:
+            if select_btn.fell:
                 if not browse_mode and not view_mode:
-                    all_images = get_sorted_images()
+                    # Listed at startup and updated on capture; rescan only
+                    # if it's empty (e.g. the card was swapped)
+                    if not all_images:
+                        all_images = get_sorted_images()
+                    if all_images and browse_bitmap is None:
+                        # ~115KB, allocated on first use - by then uploads may
+                        # have fragmented the heap, so collect first and fail soft
+                        gc.collect()
+                        try:
+                            from jpegio import JpegDecoder
+                            decoder = JpegDecoder()
+                            browse_bitmap = displayio.Bitmap(240, 240, 65535)
+                        except MemoryError:
+                            decoder = None
+                            gc.collect()
+                            logger.error("Not enough memory to open browse mode")
+                            pycam.display_message("Low memory", color=0xFF0000)
+                            message_until = time.monotonic() + 2
+                            continue
                     if all_images:
                         file_index = -1
                         browse_mode = True
@@ -1679,17 +2281,18 @@ def main():
                         logger.info("Browse mode: ON (LEFT/RIGHT to navigate, OK to send)")
                     else:
                         pycam.display_message("No images", color=0xFF0000)
-                        time.sleep(Config.MSG_DURATION)
+                        message_until = time.monotonic() + msg_duration
                 elif browse_mode:
                     browse_mode = False
-                    pycam.display.refresh()
+                    needs_refresh = True
                     logger.info("Browse mode: OFF")
 
             # OK - Confirm/Close
-            if pycam.ok.fell:
+            if ok_btn.fell:
                 if view_mode:
                     logger.info("OK pressed - closing text viewer and returning to viewfinder")
                     text_viewer.clear()
+                    gc.collect()  # Response text and page cache just released
                     showing_captured_image = False
                     view_mode = False
                     browse_mode = False  # Ensure browse mode is off
@@ -1702,13 +2305,12 @@ def main():
                     except (RuntimeError, AttributeError) as e:
                         logger.error("Failed to restart viewfinder: {}", e)
 
-                    # Force display refresh
-                    pycam.display.refresh()
+                    needs_refresh = True
                     logger.info("Back to viewfinder mode - shutter enabled, UI will be re-added")
 
                 elif browse_mode:
                     filename = all_images[file_index]
-                    filename_only = filename.split('/')[-1]
+                    filename_only = _basename(filename)
                     logger.info("Sending browsed image: {}", filename_only)
 
                     show_status_overlay(pycam, "Sending to Claude... (SELECT to cancel)", 0x00DDDD)
@@ -1733,7 +2335,7 @@ def main():
                         response_verbose = response
 
                         # Save full response to SD card
-                        if Config.SAVE_FULL_RESPONSES:
+                        if save_full_responses:
                             save_response_to_sd(filename, response_verbose, prompt_labels[prompt_index])
 
                         # Show with toggle capability
@@ -1741,31 +2343,31 @@ def main():
                         view_mode = True
 
                         del response, response_brief, response_verbose  # Free memory
-                        gc.collect()
+                        _maybe_gc()
                     else:
                         clear_status_overlay(pycam)
                         # Show cancelled in yellow, errors in red
                         error_color = 0xFFFF00 if "Cancelled" in response else 0xFF0000
                         pycam.display_message(response, color=error_color)
-                        time.sleep(2)
-                        pycam.display.refresh()
-                        gc.collect()
+                        message_until = time.monotonic() + 2
+                        _maybe_gc()
 
-            gc.collect()
+            if needs_refresh:
+                display.refresh()
 
         except KeyboardInterrupt:
             logger.info("Shutting down...")
             break
 
         except Exception as e:
-            logger.error("Main loop error: {}", e)
+            _log_exception("Main loop error:", e)
             try:
                 pycam.display_message("System Error", color=0xFF0000)
                 time.sleep(1)
-                pycam.display.refresh()
+                display.refresh()
             except (RuntimeError, AttributeError):
                 pass
-            gc.collect()
+            _maybe_gc()
 
 # ============================================================================
 # ENTRY POINT
@@ -1775,5 +2377,5 @@ if __name__ == "__main__":
     try:
         main()
     except Exception as e:
-        logger.error("Fatal error: {}", e)
+        _log_exception("Fatal error:", e)
         print("System halted. Please reset device.")